@@ -1,94 +1,270 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
+import lxml.html
 import csv
+import functools
+import io
 import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
 import py7zr
 import argparse
 import geopandas as gpd
+import pandas as pd
+from pyproj import CRS
 import logging
+import multiprocessing
 from tqdm import tqdm
 import multivolumefile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
-import requests
-from bs4 import BeautifulSoup
-import csv
-from tqdm import tqdm
-import logging
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_SEGMENTS = 4
+SEGMENTED_DOWNLOAD_MIN_SIZE = 64 * 1024 * 1024
+# Archives are already compressed: ask for the raw bytes, which also keeps range offsets valid
+ARCHIVE_HEADERS = {'Accept-Encoding': 'identity'}
+
+# Shared session so connections (and TLS sessions) to the IGN server are reused across downloads
+SESSION = requests.Session()
+ADAPTER = HTTPAdapter(pool_connections=DOWNLOAD_WORKERS, pool_maxsize=DOWNLOAD_WORKERS,
+                      max_retries=Retry(total=3, backoff_factor=0.5))
+SESSION.mount('https://', ADAPTER)
+SESSION.mount('http://', ADAPTER)
+# Files and their segments share this limit so we never open more than DOWNLOAD_WORKERS connections to the IGN server
+CONNECTION_SLOTS = threading.BoundedSemaphore(DOWNLOAD_WORKERS)
+
+# Premier mot entièrement numérique du titre, p. ex. "01" dans "Département 01 - Ain"
+DEPARTMENT_CODE_PATTERN = re.compile(r'(?<!\S)\d+(?!\S)')
 
 
 def fetch_download_links(url, csv_filename, type_filter):
     try:
-        response = requests.get(url)
+        response = SESSION.get(url)
         response.raise_for_status()  # Raise HTTPError pour les mauvaises réponses
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Sans charset dans l'en-tête HTTP, détecter l'encodage comme le faisait BeautifulSoup
+        if 'charset' in response.headers.get('Content-Type', '').lower():
+            encoding = response.encoding
+        else:
+            encoding = response.apparent_encoding or 'utf-8'
+        doc = lxml.html.fromstring(response.content, parser=lxml.html.HTMLParser(encoding=encoding))
         links = {}
-        
-        # Chercher le titre de la dernière édition
-        title = soup.find('h3', id='bd-ortho-dernière-édition')
-        if title:
-            for sibling in title.find_next_siblings():
-                if sibling.name == 'h3' and sibling.get('id') == 'bd-ortho-anciennes-éditions':
-                    break  # Arrêter si on atteint la section des anciennes éditions
-                if sibling.name == 'p' and 'Département' in sibling.get_text():
-                    department_info = sibling.get_text(strip=True)
-                    parts = department_info.split(' ')
-                    department_code = None
-                    for part in parts:
-                        if part.isdigit():
-                            department_code = part
-                            break
-                elif sibling.name == 'ul' and department_code:
-                    if department_code not in links:
-                        links[department_code] = []
-                    for link in sibling.find_all('a', href=True):
-                        download_link = link['href']
-                        if type_filter in download_link:
-                            links[department_code].append(download_link)
-        
+        department_code = None
+
+        # Chercher le titre de la dernière édition et parcourir ses éléments suivants
+        for element in doc.xpath("//h3[@id='bd-ortho-dernière-édition']/following-sibling::*"):
+            if element.tag == 'h3' and element.get('id') == 'bd-ortho-anciennes-éditions':
+                break  # Arrêter si on atteint la section des anciennes éditions
+            if element.tag == 'p' and 'Département' in element.text_content():
+                match = DEPARTMENT_CODE_PATTERN.search(element.text_content())
+                department_code = match.group(0) if match else None
+            elif element.tag == 'ul' and department_code:
+                department_links = links.setdefault(department_code, [])
+                department_links.extend(href for href in element.xpath('.//a/@href') if type_filter in href)
+
         if not links:
             logging.warning(f"Aucun lien de téléchargement trouvé pour le type {type_filter}.")
         else:
+            rows = [[department_code, link] for department_code, department_links in links.items() for link in department_links]
             with open(csv_filename, mode='w', newline='', encoding='utf-8') as file:
                 writer = csv.writer(file)
                 writer.writerow(['Code', 'Link'])
-                for department_code, department_links in tqdm(links.items(), desc="Fetching links"):
-                    for link in department_links:
-                        writer.writerow([department_code, link])
+                writer.writerows(rows)
             logging.info(f"Les liens de téléchargement pour le type {type_filter} ont été sauvegardés dans '{csv_filename}'.")
     except requests.exceptions.RequestException as e:
         logging.error(f"Erreur de requête HTTP : {e}")
 
 
+def _remove_partial_download(filename):
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+
+
+def _download_stream(link, filename):
+    with CONNECTION_SLOTS, SESSION.get(link, headers=ARCHIVE_HEADERS, stream=True) as response:
+        response.raise_for_status()
+        content_length = int(response.headers.get('Content-Length', 0))
+        try:
+            with open(filename, 'wb') as f:
+                # Reserve the whole file up front to limit fragmentation of multi-GB archives
+                if content_length and hasattr(os, 'posix_fallocate'):
+                    os.posix_fallocate(f.fileno(), 0, content_length)
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                # Drop any reserved space left over if the decoded body is shorter
+                f.truncate()
+        except BaseException:
+            # A partial file would look like a complete download since its size was reserved
+            _remove_partial_download(filename)
+            raise
+
+
+def _download_range(link, fd, start, end):
+    with CONNECTION_SLOTS, SESSION.get(link, headers={**ARCHIVE_HEADERS, 'Range': f'bytes={start}-{end}'}, stream=True) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise requests.exceptions.HTTPError(f"Range request not honoured for {link}", response=response)
+
+        offset = start
+        while True:
+            chunk = response.raw.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+    if offset != end + 1:
+        raise requests.exceptions.ConnectionError(f"Incomplete range bytes={start}-{end} for {link}")
+
+
+def _download_segmented(link, filename, content_length):
+    segment_size = -(-content_length // DOWNLOAD_SEGMENTS)
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, content_length)
+            else:
+                os.ftruncate(fd, content_length)
+            with ThreadPoolExecutor(max_workers=DOWNLOAD_SEGMENTS) as executor:
+                futures = [executor.submit(_download_range, link, fd, start, min(start + segment_size, content_length) - 1)
+                           for start in range(0, content_length, segment_size)]
+                for future in futures:
+                    future.result()
+        finally:
+            os.close(fd)
+    except BaseException:
+        # The file has its full size from the start, so never leave an incomplete one behind
+        _remove_partial_download(filename)
+        raise
+
+
+def _ranged_length(link):
+    """
+    Returns the size of the file if the server accepts byte range requests for it, 0 otherwise.
+
+    :param link: URL of the file
+    """
+    try:
+        with CONNECTION_SLOTS:
+            head = SESSION.head(link, headers=ARCHIVE_HEADERS, allow_redirects=True)
+        head.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        # Some servers reject HEAD requests: a plain download still works
+        logging.info(f"HEAD request failed for {link}, downloading it in a single stream: {e}")
+        return 0
+    if head.headers.get('Accept-Ranges') != 'bytes':
+        return 0
+    return int(head.headers.get('Content-Length', 0))
+
+
+def _download_one(link, filename):
+    try:
+        logging.info(f"Downloading {link} to {filename}")
+        content_length = _ranged_length(link)
+        # Large archives are fetched as several byte ranges in parallel when the server allows it
+        if content_length >= SEGMENTED_DOWNLOAD_MIN_SIZE and hasattr(os, 'pwrite'):
+            _download_segmented(link, filename, content_length)
+        else:
+            _download_stream(link, filename)
+        logging.info(f"Successfully downloaded {filename}")
+        return True
+    # Reading the raw stream bypasses requests, so urllib3 errors are not wrapped in RequestException
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        logging.error(f"Error downloading {link}: {e}")
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _read_links(csv_path, mtime):
+    # Categorical codes are parsed as strings (keeping e.g. '01') and grouped by category index
+    df = pd.read_csv(csv_path, usecols=['Code', 'Link'], dtype={'Code': 'category', 'Link': str})
+    return df.groupby('Code', observed=True)['Link'].apply(list).to_dict()
+
+
+def _load_links(csv_path):
+    """
+    Loads the download links of the CSV grouped by department code.
+
+    The result is cached as long as the CSV file is not modified.
+
+    :param csv_path: Path to the CSV file
+    :return: Dictionary mapping each code to its list of links
+    """
+    return _read_links(os.path.abspath(csv_path), os.path.getmtime(csv_path))
+
+
 def download_data_from_csv(csv_path, region):
-    links = []
     try:
-        with open(csv_path, mode='r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if row['Code'] == region:
-                    links.append(row['Link'])
+        links_by_code = _load_links(csv_path)
     except FileNotFoundError:
         logging.error(f"CSV file {csv_path} not found.")
         return
 
+    download_data(links_by_code, region)
+
+
+def download_data(links_by_code, region):
+    """
+    Downloads the files of the specified region.
+
+    :param links_by_code: Dictionary mapping each code to its list of links
+    :param region: Code or name of the region
+    """
+    links = links_by_code.get(region, [])
     region_dir = os.path.join('downloads', region)
     os.makedirs(region_dir, exist_ok=True)
 
-    for link in tqdm(links, desc=f"Downloading files for region {region}"):
-        filename = os.path.join(region_dir, os.path.basename(link))
-        try:
-            logging.info(f"Downloading {link} to {filename}")
-            response = requests.get(link, stream=True)
-            response.raise_for_status()
-            with open(filename, 'wb') as f:
-                for chunk in response.iter_content(1024):
-                    f.write(chunk)
-            logging.info(f"Successfully downloaded {filename}")
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Error downloading {link}: {e}")
+    # Downloads are I/O-bound: run a bounded number of them concurrently so we
+    # don't hammer the IGN server
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        futures = [executor.submit(_download_one, link, os.path.join(region_dir, os.path.basename(link)))
+                   for link in links]
+        for future in tqdm(as_completed(futures), total=len(futures), desc=f"Downloading files for region {region}"):
+            future.result()
+
+# Larger read buffer than py7zr's 1 MiB default, fewer Python-level round trips per LZMA2 stream
+EXTRACT_BLOCKSIZE = 4 * 1024 * 1024
+# The native 7-Zip binary decompresses much faster than py7zr when it is installed
+SEVENZIP_EXECUTABLE = shutil.which('7z') or shutil.which('7zz')
+# 7-Zip already uses every core for one archive: only run a few of them side by side
+SEVENZIP_WORKERS = 2
+
+
+def _extraction_executor():
+    if SEVENZIP_EXECUTABLE:
+        return ThreadPoolExecutor(max_workers=SEVENZIP_WORKERS)
+    # Do not fork: the stream command starts these workers while download threads are running
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context(start_method))
+
+
+def _extract_one(region_dir, base_name):
+    if SEVENZIP_EXECUTABLE:
+        # 7-Zip detects the other volumes from the .001 suffix
+        subprocess.run([SEVENZIP_EXECUTABLE, 'x', '-mmt=on', '-bsp0', '-bso0', '-y', f'-o{region_dir}',
+                        os.path.join(region_dir, base_name + ".7z.001")], check=True)
+        return
+
+    with multivolumefile.open(os.path.join(region_dir, base_name + ".7z"), mode='rb') as target_archive:
+        with py7zr.SevenZipFile(target_archive, 'r', blocksize=EXTRACT_BLOCKSIZE) as archive:
+            archive.extractall(path=region_dir)
+
+
+def _find_archives(region_dir):
+    with os.scandir(region_dir) as entries:
+        return {entry.name[:-7] for entry in entries
+                if entry.name.endswith(".7z.001") and entry.is_file(follow_symlinks=False)}
+
 
 def extract_and_merge_7z_files(region):
     region_dir = os.path.join('downloads', region)
@@ -96,25 +272,179 @@ def extract_and_merge_7z_files(region):
         logging.error(f"Directory {region_dir} does not exist.")
         return
 
-    base_names = set()
-    for filename in os.listdir(region_dir):
-        if filename.endswith(".7z.001"):
-            base_name = filename[:-7]
-            base_names.add(base_name)
-
+    base_names = _find_archives(region_dir)
     if not base_names:
         logging.info(f"No .7z.001 files found in {region_dir}")
         return
 
     try:
-        for base_name in tqdm(base_names, desc=f"Extracting files for region {region}"):
-            with multivolumefile.open(os.path.join(region_dir, base_name + ".7z"), mode='rb') as target_archive:
-                with py7zr.SevenZipFile(target_archive, 'r') as archive:
-                    archive.extractall(path=region_dir)
+        # Decompression is CPU-bound and archives are independent: extract them in parallel
+        with _extraction_executor() as executor:
+            futures = [executor.submit(_extract_one, region_dir, base_name) for base_name in base_names]
+            for future in tqdm(as_completed(futures), total=len(futures), desc=f"Extracting files for region {region}"):
+                future.result()
         logging.info(f"Decompression completed for region {region}")
-    except py7zr.Bad7zFile as e:
+    except (py7zr.Bad7zFile, subprocess.CalledProcessError) as e:
         logging.error(f"Error during extraction: {e}")
 
+def iter_archive(region, predicate=None):
+    """
+    Decompresses the downloaded .7z files for the specified region in memory instead of on disk.
+
+    Each archive is decompressed in one pass, so all its selected files are held in memory before the
+    first one is yielded: without a predicate, a whole department archive (tens of GB) ends up in RAM.
+    Requires py7zr 1.0 or later.
+
+    :param region: Code or name of the region
+    :param predicate: Optional function called with each file name in the archives; only the files
+        for which it returns True are decompressed
+    :return: Generator of (file name, io.BytesIO) pairs
+    """
+    # In-memory extraction needs py7zr >= 1.0: import it here so the other commands work with older versions
+    import py7zr.io
+
+    region_dir = os.path.join('downloads', region)
+    if not os.path.exists(region_dir):
+        logging.error(f"Directory {region_dir} does not exist.")
+        return
+
+    for base_name in _find_archives(region_dir):
+        with multivolumefile.open(os.path.join(region_dir, base_name + ".7z"), mode='rb') as target_archive:
+            with py7zr.SevenZipFile(target_archive, 'r', blocksize=EXTRACT_BLOCKSIZE) as archive:
+                # Select the files before decoding so unwanted ones are never decompressed
+                targets = None if predicate is None else [name for name in archive.getnames() if predicate(name)]
+                if targets == []:
+                    continue
+                factory = py7zr.io.BytesIOFactory(sys.maxsize)
+                archive.extract(targets=targets, factory=factory)
+        # Hand out real BytesIO objects, dropping py7zr's buffer first so each file is only held once
+        for name in list(factory.products):
+            data = factory.products.pop(name)
+            data.seek(0)
+            content = data.read()
+            del data
+            yield name, io.BytesIO(content)
+
+VOLUME_PATTERN = re.compile(r'^(.+)\.7z\.\d+$')
+
+
+def download_and_extract(csv_path, region):
+    """
+    Downloads the files of the specified region and decompresses each archive as soon as all its volumes are downloaded.
+
+    :param csv_path: Path to the CSV file
+    :param region: Code or name of the region
+    """
+    try:
+        links_by_code = _load_links(csv_path)
+    except FileNotFoundError:
+        logging.error(f"CSV file {csv_path} not found.")
+        return
+
+    region_dir = os.path.join('downloads', region)
+    os.makedirs(region_dir, exist_ok=True)
+
+    # Count the volumes of each archive to know when it is complete, ignoring repeated links
+    files = {}
+    for link in dict.fromkeys(links_by_code.get(region, [])):
+        filename = os.path.basename(link)
+        match = VOLUME_PATTERN.match(filename)
+        files[link] = (os.path.join(region_dir, filename), match.group(1) if match else None)
+    remaining_volumes = {}
+    for _, base_name in files.values():
+        if base_name:
+            remaining_volumes[base_name] = remaining_volumes.get(base_name, 0) + 1
+
+    # Extraction of complete archives runs while the remaining volumes are still downloading
+    failed_archives = set()
+    extract_futures = []
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as downloader, _extraction_executor() as extractor:
+        download_futures = {downloader.submit(_download_one, link, filename): base_name
+                            for link, (filename, base_name) in files.items()}
+        for future in tqdm(as_completed(download_futures), total=len(download_futures), desc=f"Downloading files for region {region}"):
+            base_name = download_futures[future]
+            if base_name is None:
+                continue
+            if not future.result():
+                failed_archives.add(base_name)
+            remaining_volumes[base_name] -= 1
+            if remaining_volumes[base_name] == 0 and base_name not in failed_archives:
+                extract_futures.append(extractor.submit(_extract_one, region_dir, base_name))
+
+        for future in tqdm(as_completed(extract_futures), total=len(extract_futures), desc=f"Extracting files for region {region}"):
+            try:
+                future.result()
+            except (py7zr.Bad7zFile, subprocess.CalledProcessError) as e:
+                logging.error(f"Error during extraction: {e}")
+
+    for base_name in failed_archives:
+        logging.error(f"Skipped extraction of {base_name}: some volumes could not be downloaded")
+    for base_name, remaining in remaining_volumes.items():
+        if remaining > 0:
+            logging.error(f"Skipped extraction of {base_name}: {remaining} volume(s) never completed")
+    logging.info(f"Decompression completed for region {region}")
+
+TARGET_CRS = CRS.from_epsg(2154)
+
+
+def _to_target_crs(gdf):
+    # Compare CRS objects rather than strings so data already in 2154 is not reprojected
+    if gdf.crs is None or not gdf.crs.equals(TARGET_CRS):
+        gdf = gdf.to_crs(TARGET_CRS)
+    return gdf
+
+
+def _select_bbox(gdf, bbox):
+    # Vectorized test of the feature bounds against the bounding box
+    xmin, ymin, xmax, ymax = bbox
+    bounds = gdf.geometry.bounds.to_numpy()
+    in_bbox = (bounds[:, 2] >= xmin) & (bounds[:, 0] <= xmax) & (bounds[:, 3] >= ymin) & (bounds[:, 1] <= ymax)
+    return gdf[in_bbox]
+
+
+def _source_mtime(path):
+    # A shapefile is several files: the attributes (.dbf) or projection (.prj) can change without the .shp
+    base, ext = os.path.splitext(path)
+    files = [path]
+    if ext.lower() == '.shp':
+        files += [base + sidecar for sidecar in ('.shx', '.dbf', '.prj', '.cpg') if os.path.exists(base + sidecar)]
+    return max(os.stat(file).st_mtime_ns for file in files)
+
+
+def _read_in_target_crs(path, columns=None, bbox=None):
+    """
+    Reads a vector file reprojected to EPSG:2154, caching it as FlatGeobuf next to the source file.
+
+    :param path: Path to the vector file
+    :param columns: Attribute columns to read
+    :param bbox: Optional (xmin, ymin, xmax, ymax) bounding box in EPSG:2154 to only read the features intersecting it
+    :return: GeoDataFrame in EPSG:2154
+    """
+    # The cache only holds the requested columns, so they are part of its name
+    base = os.path.splitext(path)[0]
+    cache_file = f"{base}.{'-'.join(columns) if columns else 'all'}.2154.fgb"
+    # The cache carries the source modification time: any replaced source file, even an older one, invalidates it
+    source_mtime = _source_mtime(path)
+    if not os.path.exists(cache_file) or os.stat(cache_file).st_mtime_ns != source_mtime:
+        gdf = _to_target_crs(gpd.read_file(path, engine='pyogrio', columns=columns))
+        # Write under a temporary name so an interrupted write never leaves a truncated cache behind
+        tmp_file = os.path.splitext(cache_file)[0] + f'.{os.getpid()}.tmp.fgb'
+        try:
+            gdf.to_file(tmp_file, driver='FlatGeobuf', engine='pyogrio')
+            os.utime(tmp_file, ns=(source_mtime, source_mtime))
+            os.replace(tmp_file, cache_file)
+        except BaseException as e:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            if not isinstance(e, Exception):
+                raise
+            logging.warning(f"Could not cache reprojected {path} to {cache_file}: {e}")
+            return gdf if bbox is None else _select_bbox(gdf, bbox)
+
+    # FlatGeobuf embeds a packed R-tree, so the bounding box is resolved before any feature is loaded
+    return gpd.read_file(cache_file, engine='pyogrio', columns=columns, bbox=bbox)
+
+
 def prepare_data_based_on_shapefiles(input_shapefile, department_geojson, csv_filename):
     """
     Downloads data for departments intersected with the input shapefile.
@@ -124,27 +454,42 @@ def prepare_data_based_on_shapefiles(input_shapefile, department_geojson, csv_fi
     :param csv_filename: Path to the CSV file containing the download links
     """
     try:
-        departments = gpd.read_file(department_geojson)
-        input_data = gpd.read_file(input_shapefile)
+        departments = _read_in_target_crs(department_geojson, columns=['code'])
+        input_data = gpd.read_file(input_shapefile, engine='pyogrio')
     except Exception as e:
         logging.error(f"Error reading shapefile or GeoJSON: {e}")
         return
 
     #I reproject everything to 2154 to avoid issues with the spatial intersection
-    if departments.crs != 'EPSG:2154':
-        departments = departments.to_crs('EPSG:2154')
-    if input_data.crs != 'EPSG:2154':
-        input_data = input_data.to_crs('EPSG:2154')
+    input_data = _to_target_crs(input_data)
 
     try:
-        intersected_departments = gpd.overlay(departments, input_data, how='intersection', keep_geom_type=False)
-        department_codes = intersected_departments['code'].unique()
+        # Only the intersecting codes are needed, not the intersection geometries
+        _, department_idx = departments.sindex.query(input_data.geometry, predicate='intersects')
+        department_codes = departments['code'].iloc[department_idx].unique()
     except Exception as e:
         logging.error(f"Error during spatial intersection: {e}")
         return
 
+    try:
+        links_by_code = _load_links(csv_filename)
+    except FileNotFoundError:
+        logging.error(f"CSV file {csv_filename} not found.")
+        return
+
     for code in department_codes:
-        download_data_from_csv(csv_filename, code)
+        download_data(links_by_code, code)
+
+REMOVE_WORKERS = 16
+
+
+def _remove_tile(tile_file):
+    try:
+        os.remove(tile_file)
+        logging.info(f"Removed tile {tile_file}")
+    except FileNotFoundError:
+        pass
+
 
 def filter_tiles_by_intersection(reference_shapefile, tiles_shapefile, data_directory):
     """
@@ -155,33 +500,37 @@ def filter_tiles_by_intersection(reference_shapefile, tiles_shapefile, data_dire
     :param data_directory: Path to the directory containing the tile images
     """
     try:
-        reference = gpd.read_file(reference_shapefile)
-        tiles = gpd.read_file(tiles_shapefile)
+        #I reproject everything to 2154 to avoid issues with the spatial intersection
+        reference = _to_target_crs(gpd.read_file(reference_shapefile, engine='pyogrio'))
+        all_tiles = set(gpd.read_file(tiles_shapefile, engine='pyogrio', columns=['NOM'], ignore_geometry=True)['NOM'].unique())
+        # Only the tiles within the reference bounding box are loaded with their geometry
+        candidates = _read_in_target_crs(tiles_shapefile, columns=['NOM'], bbox=tuple(reference.total_bounds))
     except Exception as e:
         logging.error(f"Error reading shapefile: {e}")
         return
 
-    #I reproject everything to 2154 to avoid issues with the spatial intersection
-    if reference.crs != 'EPSG:2154':
-        reference = reference.to_crs('EPSG:2154')
-    if tiles.crs != 'EPSG:2154':
-        tiles = tiles.to_crs('EPSG:2154')
-
     try:
-        intersected_tiles = gpd.overlay(tiles, reference, how='intersection', keep_geom_type=False)
-        intersected_tile_ids = intersected_tiles['NOM'].unique()  
+        # Keep the reference on the input side: shapely prepares input geometries when
+        # evaluating the predicate, which makes complex reference polygons cheap to test
+        _, tile_idx = candidates.sindex.query(reference.geometry, predicate='intersects')
+        intersected_tile_ids = candidates['NOM'].iloc[tile_idx].unique()
     except Exception as e:
         logging.error(f"Error during spatial intersection: {e}")
         return
 
-    all_tiles = set(tiles['NOM'].unique())
     tiles_to_remove = all_tiles - set(intersected_tile_ids)
 
-    for tile_id in tiles_to_remove:
-        tile_file = os.path.join(data_directory, f"{tile_id}")
-        if os.path.exists(tile_file):
-            os.remove(tile_file)
-            logging.info(f"Removed tile {tile_file}")
+    # List the directory once instead of checking each tile file separately
+    try:
+        with os.scandir(data_directory) as entries:
+            existing_files = {entry.name: entry.path for entry in entries}
+    except FileNotFoundError:
+        logging.error(f"Directory {data_directory} does not exist.")
+        return
+
+    tile_files = [existing_files[f"{tile_id}"] for tile_id in tiles_to_remove if f"{tile_id}" in existing_files]
+    with ThreadPoolExecutor(max_workers=REMOVE_WORKERS) as executor:
+        list(executor.map(_remove_tile, tile_files))
 
 def main():
     parser = argparse.ArgumentParser(description="Download and process BD ORTHO data.")
@@ -199,6 +548,10 @@ def main():
     parser_extract = subparsers.add_parser('extract', help="Decompresses the downloaded .7z files for the specified region.")
     parser_extract.add_argument('region', type=str, help="Code or name of the region")
 
+    parser_stream = subparsers.add_parser('stream', help="Downloads and decompresses the files for the specified region, extracting each archive as soon as it is downloaded.")
+    parser_stream.add_argument('csv_path', type=str, help="Path to the CSV file")
+    parser_stream.add_argument('region', type=str, help="Code or name of the region")
+
     parser_shapefile = subparsers.add_parser('shapefile', help="Downloads data for departments intersected with a shapefile.")
     parser_shapefile.add_argument('input_shapefile', type=str, help="Path to the shapefile containing the entities")
     parser_shapefile.add_argument('department_geojson', type=str, help="Path to the GeoJSON of the departments")
@@ -217,6 +570,8 @@ def main():
         download_data_from_csv(args.csv_path, args.region)
     elif args.command == 'extract':
         extract_and_merge_7z_files(args.region)
+    elif args.command == 'stream':
+        download_and_extract(args.csv_path, args.region)
     elif args.command == 'shapefile':
         prepare_data_based_on_shapefiles(args.input_shapefile, args.department_geojson, args.csv_filename)
     elif args.command == 'filter':